@@ -1,16 +1,48 @@
+import functools
 import json
+import logging
+import subprocess
 import time
 import os
 import threading
+from collections import namedtuple
 from datetime import datetime
-from gpiozero import PWMOutputDevice
-from flask import Flask, request, jsonify, send_from_directory
+
+try:
+    import orjson  # much faster (de)serialization; optional
+except ImportError:
+    orjson = None
+from gpiozero import Device, PWMOutputDevice
+from flask import Flask, request, jsonify, send_from_directory, Response
+
+# Prefer pigpio's DMA-backed PWM over the default software PWM, which
+# runs a busy Python thread per device and glitches during fades.
+# Respect an explicit GPIOZERO_PIN_FACTORY choice, and fall back to the
+# default factory when pigpiod isn't running.
+if not os.environ.get("GPIOZERO_PIN_FACTORY"):
+    try:
+        from gpiozero.pins.pigpio import PiGPIOFactory
+        Device.pin_factory = PiGPIOFactory()
+    except Exception:
+        pass
+
+logger = logging.getLogger(__name__)
 
 CONFIG_FILE = "config.json"
 config_lock = threading.Lock()
 config = {}
+_last_written_json = None  # bytes last written to disk, to skip no-op saves
+_config_generation = 0  # bumped every time a new config dict is published
+config_changed = threading.Event()  # wakes pump_loop when config changes
+
+# Indexed by datetime.weekday(); cheaper than strftime("%a") per tick
+_DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
 
 app = Flask(__name__)
+# Skip key sorting and pretty-printing on jsonify responses; /status is
+# polled frequently and the defaults waste CPU and bytes on every call
+app.json.sort_keys = False
+app.json.compact = True
 
 # ----------------------
 # Default configuration
@@ -30,19 +62,82 @@ DEFAULT_CONFIG = {
     "enabled": True
 }
 
+# ----------------------
+# Derived pump parameters
+# ----------------------
+# Validated/converted view of the config, rebuilt once per publish so
+# the hot loops read plain attributes instead of redoing dict lookups,
+# float casts and clamps every iteration
+@functools.lru_cache(maxsize=32)
+def _hm_to_min(s):
+    # "HH:MM" -> minutes since midnight; cached since the strings only
+    # change with the config. Much cheaper than datetime.strptime.
+    h, m = s.split(":")
+    return int(h) * 60 + int(m)
+
+PumpParams = namedtuple("PumpParams", [
+    "pin", "interval", "fade_time", "on_duration", "min_speed",
+    "max_speed", "active_days", "start_min", "end_min", "enabled",
+    "manual_on", "flush_on",
+])
+
+def _derive_params(cfg):
+    return PumpParams(
+        pin=int(cfg.get("pump_pin", 18)),
+        interval=max(1.0, float(cfg.get("interval_ms", 5000)) / 1000.0),
+        fade_time=max(0.0, float(cfg.get("fade_time_ms", 1000)) / 1000.0),
+        on_duration=max(0.1, float(cfg.get("on_duration_ms", 2000)) / 1000.0),
+        min_speed=max(0.0, min(1.0, float(cfg.get("pump_speed_min", 0.0)))),
+        max_speed=max(0.0, min(1.0, float(cfg.get("pump_speed_max", 1.0)))),
+        active_days=frozenset(cfg.get("active_days", [])),
+        start_min=_hm_to_min(cfg.get("start_time", "00:00")),
+        end_min=_hm_to_min(cfg.get("end_time", "23:59")),
+        enabled=bool(cfg.get("enabled", True)),
+        manual_on=bool(cfg.get("manual_on", False)),
+        flush_on=bool(cfg.get("flush_on", False)),
+    )
+
+_pump_params = _derive_params(DEFAULT_CONFIG)
+
 # ----------------------
 # Config handling
 # ----------------------
+def _publish_config(new_cfg):
+    # Single choke point for rebinding the config global, so caches
+    # keyed on the generation counter invalidate on every change
+    global config, _config_generation, _pump_params
+    try:
+        params = _derive_params(new_cfg)
+    except Exception as e:
+        print(f"Error deriving pump parameters: {e}")
+        params = _derive_params(DEFAULT_CONFIG)
+    with config_lock:
+        config = new_cfg
+        _config_generation += 1
+        _pump_params = params
+    _schedule_active.cache_clear()
+    config_changed.set()
+
+_cfg_mtime = 0  # st_mtime_ns of the config file version last parsed
+
 def load_config():
-    global config
+    global _cfg_mtime
     try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, "r") as f:
-                cfg = json.load(f)
-                if not isinstance(cfg, dict):
-                    cfg = {}
+        try:
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        except FileNotFoundError:
+            mtime = 0
+        if mtime and mtime == _cfg_mtime and config:
+            return  # file unchanged since we last parsed (or wrote) it
+        if mtime:
+            with open(CONFIG_FILE, "rb") as f:
+                raw = f.read()
+            cfg = orjson.loads(raw) if orjson else json.loads(raw)
+            if not isinstance(cfg, dict):
+                cfg = {}
         else:
             cfg = {}
+        _cfg_mtime = mtime
     except Exception as e:
         print(f"Error loading config: {e}")
         cfg = {}
@@ -51,79 +146,142 @@ def load_config():
     updated = DEFAULT_CONFIG.copy()
     updated.update(cfg)
 
-    with config_lock:
-        config = updated
+    _publish_config(updated)
 
-    # Save back the merged config to ensure file exists
-    save_config(updated)
+    # Only write back when merging defaults actually changed something,
+    # so a normal startup doesn't rewrite the file (SD card wear)
+    if updated != cfg:
+        save_config(updated)
     print("Config loaded:", config)
 
 def save_config(new_cfg):
-    global config
+    global _last_written_json, _cfg_mtime
     try:
-        print(f"Attempting to save config: {new_cfg}")
-        
         # Create a complete config with defaults
         complete_cfg = DEFAULT_CONFIG.copy()
         complete_cfg.update(new_cfg)
-        
-        # Write to a temporary file first
+
+        # Skip the disk write entirely if the bytes wouldn't change
+        # (e.g. rapid toggles back and forth, form resubmits)
+        if orjson:
+            payload = orjson.dumps(complete_cfg, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(complete_cfg, indent=4).encode()
+        if payload == _last_written_json:
+            _publish_config(complete_cfg.copy())
+            return True
+
+        # Write to a temporary file first. O_DSYNC makes the single
+        # write durable on its own, so no separate flush+fsync pair
         temp_file = CONFIG_FILE + ".tmp"
-        with open(temp_file, "w") as f:
-            json.dump(complete_cfg, f, indent=4)
-            f.flush()  # Ensure data is written
-            os.fsync(f.fileno())  # Force write to disk
-        
-        # Atomic rename (works on Unix systems)
-        if os.path.exists(CONFIG_FILE):
-            os.remove(CONFIG_FILE)
-        os.rename(temp_file, CONFIG_FILE)
-        
-        with config_lock:
-            config = complete_cfg.copy()
+        fd = os.open(temp_file,
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DSYNC,
+                     0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
         
+        # Atomic replace; overwrites the target in one step
+        os.replace(temp_file, CONFIG_FILE)
+        _last_written_json = payload
+        # Record the mtime of our own write so the watcher thread and
+        # load_config don't treat it as an external change and re-parse
+        try:
+            _cfg_mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        except OSError:
+            pass
+
+        _publish_config(complete_cfg.copy())
+
         print("Config saved successfully")
         return True
     except Exception as e:
-        print(f"Error saving config: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error saving config")
         # Clean up temp file if it exists
         try:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-        except:
+            os.unlink(temp_file)
+        except FileNotFoundError:
+            pass
+        except Exception:
             pass
         return False
 
+# ----------------------
+# Debounced config writer
+# ----------------------
+# Route handlers update the in-memory config immediately and hand the
+# disk write off to a background thread, so rapid successive toggles
+# collapse into one fsync+rename instead of blocking each request on
+# SD card latency (~5-20ms per write).
+_dirty_event = threading.Event()
+_pending_cfg = None
+_pending_lock = threading.Lock()
+
+def mark_dirty(new_cfg):
+    global _pending_cfg
+    complete_cfg = DEFAULT_CONFIG.copy()
+    complete_cfg.update(new_cfg)
+    _publish_config(complete_cfg.copy())
+    with _pending_lock:
+        _pending_cfg = complete_cfg
+    _dirty_event.set()
+
+def config_writer_loop():
+    global _pending_cfg
+    while True:
+        _dirty_event.wait()
+        time.sleep(0.1)  # short window to coalesce bursts of changes
+        _dirty_event.clear()
+        with _pending_lock:
+            cfg = _pending_cfg
+            _pending_cfg = None
+        if cfg is not None:
+            save_config(cfg)
+
 # ----------------------
 # Helpers
 # ----------------------
-def time_in_range(start_str, end_str, now):
-    try:
-        start = datetime.strptime(start_str, "%H:%M").time()
-        end = datetime.strptime(end_str, "%H:%M").time()
-        if start < end:
-            return start <= now <= end
-        else:
-            return now >= start or now <= end
-    except Exception as e:
-        print(f"Error checking time range: {e}")
+def time_in_range(start_min, end_min, now_min):
+    # All arguments are minutes since midnight
+    if start_min < end_min:
+        return start_min <= now_min <= end_min
+    else:
+        return now_min >= start_min or now_min <= end_min
+
+@functools.lru_cache(maxsize=512)
+def _schedule_active(day, now_min, start_min, end_min, active_days, enabled):
+    # Inputs only change at minute boundaries (or on a config edit,
+    # which clears the cache), so repeated calls within the same minute
+    # are plain cache hits
+    if not enabled:
         return False
+    return (day in active_days) and time_in_range(start_min, end_min, now_min)
 
 def fade_pwm(device, start_val, end_val, fade_time):
-    if fade_time <= 0:
-        device.value = end_val
+    if fade_time <= 0 or start_val == end_val:
+        device.value = max(0.0, min(1.0, end_val))
         return
-        
-    steps = max(10, int(fade_time * 50))  # At least 10 steps
-    step_delay = fade_time / steps
-    
-    for i in range(steps + 1):
-        val = start_val + (end_val - start_val) * (i / steps)
-        val = max(0.0, min(1.0, val))  # Clamp between 0 and 1
-        device.value = val
-        time.sleep(step_delay)
+
+    # Time-based interpolation at a fixed ~20ms tick, mirroring the
+    # Pico version's fade state machine: the output is always computed
+    # from elapsed wall-clock time, so a late tick jumps to the correct
+    # point on the ramp instead of stretching the fade
+    span = end_val - start_val
+    t0 = time.monotonic()
+    elapsed = 0.0
+    last_val = None
+    while elapsed < fade_time:
+        val = max(0.0, min(1.0, start_val + span * (elapsed / fade_time)))
+        # Skip writes below the hardware's duty resolution (~12 bits);
+        # the .value setter re-validates and hits the pin driver every
+        # call, which adds up on slow fades over a small span
+        if last_val is None or abs(val - last_val) >= 1 / 4096:
+            device.value = val
+            last_val = val
+        time.sleep(min(0.02, fade_time - elapsed))
+        elapsed = time.monotonic() - t0
+    device.value = max(0.0, min(1.0, end_val))
 
 # ----------------------
 # Pump control loop
@@ -133,14 +291,20 @@ def pump_loop():
     pump = None
     current_pin = None
     last_flush_state = False
-    
+    # Absolute start time of the next cycle; advancing it by interval
+    # each cycle keeps the period drift-free regardless of how long the
+    # fades and sleeps inside the cycle actually took
+    next_cycle = time.monotonic()
+
     while True:
         try:
-            with config_lock:
-                cfg = config.copy()
+            # Writers always replace the params struct wholesale (the
+            # rebind is atomic in CPython), so readers can grab the
+            # current reference without the lock or a copy
+            params = _pump_params
 
             # Reinitialize pump if pin changed
-            new_pin = cfg.get("pump_pin", 18)
+            new_pin = params.pin
             if current_pin != new_pin:
                 if pump:
                     pump.close()
@@ -150,33 +314,32 @@ def pump_loop():
                     print(f"Pump initialized on pin {new_pin}")
                 except Exception as e:
                     print(f"Error initializing pump on pin {new_pin}: {e}")
-                    time.sleep(5)
+                    if config_changed.wait(5):
+                        config_changed.clear()
                     continue
 
             if not pump:
-                time.sleep(1)
+                if config_changed.wait(1):
+                    config_changed.clear()
                 continue
 
             now = datetime.now()
-            current_time = now.time()
-            current_day = now.strftime("%a")
+            current_day = _DAY_NAMES[now.weekday()]
 
-            interval = max(1.0, float(cfg.get("interval_ms", 5000)) / 1000.0)
-            fade_time = max(0.0, float(cfg.get("fade_time_ms", 1000)) / 1000.0)
-            on_duration = max(0.1, float(cfg.get("on_duration_ms", 2000)) / 1000.0)
-            min_speed = max(0.0, min(1.0, float(cfg.get("pump_speed_min", 0.0))))
-            max_speed = max(0.0, min(1.0, float(cfg.get("pump_speed_max", 1.0))))
+            interval = params.interval
+            fade_time = params.fade_time
+            on_duration = params.on_duration
+            min_speed = params.min_speed
+            max_speed = params.max_speed
 
             # Check if schedule should be active (only if system is enabled)
-            schedule_active = False
-            if cfg.get("enabled", True):
-                schedule_active = (current_day in cfg.get("active_days", [])) and \
-                                  time_in_range(cfg.get("start_time", "00:00"),
-                                                cfg.get("end_time", "23:59"),
-                                                current_time)
-            
-            manual_override = cfg.get("manual_on", False)
-            flush_override = cfg.get("flush_on", False)
+            schedule_active = _schedule_active(
+                current_day, now.hour * 60 + now.minute,
+                params.start_min, params.end_min,
+                params.active_days, params.enabled)
+
+            manual_override = params.manual_on
+            flush_override = params.flush_on
 
             # Handle flush mode
             if flush_override:
@@ -185,7 +348,8 @@ def pump_loop():
                     print(f"Flush mode activated - pump at {max_speed}")
                     last_flush_state = True
                 pump.value = max_speed
-                time.sleep(0.5)
+                if config_changed.wait(0.5):
+                    config_changed.clear()
                 continue
             else:
                 # If we were in flush mode, log the exit
@@ -195,35 +359,69 @@ def pump_loop():
 
             # Handle normal operation
             if schedule_active or manual_override:
+                # Re-anchor only when genuinely behind (just became
+                # active, or a cycle overran by a whole interval) to
+                # avoid catch-up storms; a normally-timed cycle keeps
+                # the original anchor, so wake-up latency doesn't
+                # accumulate into period drift
+                nowm = time.monotonic()
+                if nowm - next_cycle > interval:
+                    next_cycle = nowm
+                next_cycle += interval
+
                 # Calculate current pump speed if we need to fade
                 current_speed = pump.value if pump else min_speed
-                
+
                 # Fade up from current speed
                 fade_pwm(pump, current_speed, max_speed, fade_time)
-                # Stay on
-                time.sleep(on_duration)
+                # Stay on; abort the cycle early if config changes
+                if config_changed.wait(on_duration):
+                    config_changed.clear()
+                    continue
                 # Fade down
                 fade_pwm(pump, max_speed, min_speed, fade_time)
-                # Wait for rest of interval
-                sleep_time = max(0.5, interval - (fade_time * 2 + on_duration))
-                time.sleep(sleep_time)
+                # Sleep until the next cycle's absolute start time
+                sleep_time = max(0.5, next_cycle - time.monotonic())
+                if config_changed.wait(sleep_time):
+                    config_changed.clear()
+                    continue
             else:
                 pump.value = min_speed
-                time.sleep(0.5)
+                # The schedule can only flip at a minute boundary (or on
+                # a config edit, which sets the event), so sleep out the
+                # rest of the minute instead of waking twice a second
+                if config_changed.wait(60 - now.second):
+                    config_changed.clear()
                 
         except Exception as e:
-            print(f"Error in pump control loop: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in pump control loop")
             time.sleep(1)
 
 # ----------------------
 # Flask routes
 # ----------------------
+# index.html served from memory; a single stat per request picks up
+# edits without re-reading and re-sniffing the file every page load
+_index_cache = {"mtime": None, "body": None}
+
 @app.route("/")
 def index():
-    # Serve the static HTML file
-    return send_from_directory('templates', 'index.html')
+    path = os.path.join("templates", "index.html")
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        if mtime != _index_cache["mtime"]:
+            with open(path, "rb") as f:
+                _index_cache["body"] = f.read()
+            _index_cache["mtime"] = mtime
+        # no-cache + ETag: browsers revalidate each load but get a
+        # bodiless 304 unless the file actually changed
+        resp = Response(_index_cache["body"], mimetype="text/html")
+        resp.headers["Cache-Control"] = "no-cache, must-revalidate"
+        resp.set_etag(hex(mtime))
+        return resp.make_conditional(request)
+    except OSError:
+        # Fall back to the plain file response if the stat/read fails
+        return send_from_directory('templates', 'index.html')
 
 @app.route("/update", methods=["POST"])
 def update_config():
@@ -232,9 +430,9 @@ def update_config():
         data = request.form.to_dict(flat=False)
         print("Raw form data received:", data)
         
-        # Start with current config
-        with config_lock:
-            new_config = config.copy()
+        # Start with a copy of the current config (safe to mutate;
+        # the published dict itself is never modified in place)
+        new_config = config.copy()
         
         # Process form data
         processed_data = {}
@@ -297,66 +495,54 @@ def update_config():
             new_config["fade_time_ms"] = max(0, new_config["fade_time_ms"])
         
         print("Final config to save:", new_config)
-        
-        if save_config(new_config):
-            return jsonify({"status": "success", "config": new_config})
-        else:
-            return jsonify({"status": "error", "message": "Failed to save config"}), 500
-                
+
+        mark_dirty(new_config)
+        return jsonify({"status": "success", "config": new_config})
+
     except Exception as e:
-        print(f"Error updating config: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error updating config")
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route("/toggle", methods=["POST"])
 def toggle_pump():
     global config
     try:
-        with config_lock:
-            cfg = config.copy()
-        
+        cfg = config.copy()
         cfg["manual_on"] = not cfg.get("manual_on", False)
         print(f"Toggling manual pump to: {cfg['manual_on']}")
-        
-        if save_config(cfg):
-            print("Manual pump toggle saved successfully")
-            return jsonify({"status": "success", "manual_on": cfg["manual_on"]})
-        else:
-            print("Failed to save manual pump toggle")
-            return jsonify({"status": "error", "message": "Failed to save config"}), 500
+
+        mark_dirty(cfg)
+        return jsonify({"status": "success", "manual_on": cfg["manual_on"]})
     except Exception as e:
-        print(f"Error toggling pump: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error toggling pump")
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route("/toggle_flush", methods=["POST"])
 def toggle_flush():
     global config
     try:
-        with config_lock:
-            cfg = config.copy()
-        
+        cfg = config.copy()
         cfg["flush_on"] = not cfg.get("flush_on", False)
         print(f"Toggling flush to: {cfg['flush_on']}")
-        
-        if save_config(cfg):
-            print("Flush toggle saved successfully")
-            return jsonify({"status": "success", "flush_on": cfg["flush_on"]})
-        else:
-            print("Failed to save flush toggle")
-            return jsonify({"status": "error", "message": "Failed to save config"}), 500
+
+        mark_dirty(cfg)
+        return jsonify({"status": "success", "flush_on": cfg["flush_on"]})
     except Exception as e:
-        print(f"Error toggling flush: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error toggling flush")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+_shutdown_started = threading.Event()
+
 @app.route("/shutdown", methods=["POST"])
 def shutdown_pi_route():
     try:
-        os.system("sudo halt")
+        # Detached so the HTTP response goes out before the system halts,
+        # and no /bin/sh fork just to run a one-word command. sudo -n
+        # fails fast instead of hanging on a password prompt, and the
+        # event keeps repeated clicks from spawning multiple halts.
+        if not _shutdown_started.is_set():
+            _shutdown_started.set()
+            subprocess.Popen(["sudo", "-n", "halt"], start_new_session=True)
         return jsonify({"status": "shutting down"})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -368,31 +554,38 @@ def test_endpoint():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Short-TTL cache for /status; UI pollers hit it every couple of
+# seconds and the answer rarely changes between consecutive polls
+_status_cache = {"ts": 0.0, "gen": -1, "payload": None}
+
 @app.route("/status")
 def get_status():
     try:
-        with config_lock:
-            cfg = config.copy()
-        
+        if (_status_cache["payload"] is not None
+                and _status_cache["gen"] == _config_generation
+                and time.monotonic() - _status_cache["ts"] < 0.5):
+            return Response(_status_cache["payload"], mimetype="application/json")
+
+        cfg = config  # lock-free snapshot; writers replace the dict wholesale
+        params = _pump_params
+
         now = datetime.now()
         current_time = now.time()
-        current_day = now.strftime("%a")
-        
+        current_day = _DAY_NAMES[now.weekday()]
+
         # Schedule only active if system is enabled
-        schedule_active = False
-        if cfg.get("enabled", True):
-            schedule_active = (current_day in cfg.get("active_days", [])) and \
-                              time_in_range(cfg.get("start_time", "00:00"),
-                                            cfg.get("end_time", "23:59"),
-                                            current_time)
-        
-        manual_override = cfg.get("manual_on", False)
-        flush_override = cfg.get("flush_on", False)
+        schedule_active = _schedule_active(
+            current_day, now.hour * 60 + now.minute,
+            params.start_min, params.end_min,
+            params.active_days, params.enabled)
+
+        manual_override = params.manual_on
+        flush_override = params.flush_on
         
         # Pump is active if ANY of these are true (manual and flush work regardless of enabled)
         pump_active = schedule_active or manual_override or flush_override
         
-        return jsonify({
+        resp = jsonify({
             "pump_active": pump_active,
             "schedule_active": schedule_active,
             "manual_on": manual_override,
@@ -401,38 +594,36 @@ def get_status():
             "current_day": current_day,
             "config": cfg
         })
+        _status_cache["payload"] = resp.get_data()
+        _status_cache["gen"] = _config_generation
+        _status_cache["ts"] = time.monotonic()
+        return resp
     except Exception as e:
-        print(f"Error in status endpoint: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in status endpoint")
         return jsonify({"status": "error", "message": str(e)}), 500
 
 # ----------------------
-# Watchdog for external config changes
+# Watcher for external config changes
 # ----------------------
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-
-class ConfigEventHandler(FileSystemEventHandler):
-    def __init__(self):
-        self.last_reload = 0
-        
-    def on_modified(self, event):
-        if event.src_path.endswith(CONFIG_FILE):
-            # Debounce to avoid multiple reloads
-            current_time = time.time()
-            if current_time - self.last_reload > 1:
-                print("Config file changed externally, reloading...")
-                self.last_reload = current_time
-                time.sleep(0.1)  # Small delay to ensure file is fully written
-                load_config()
-
-def start_watchdog():
-    event_handler = ConfigEventHandler()
-    observer = Observer()
-    observer.schedule(event_handler, ".", recursive=False)
-    observer.start()
-    return observer
+# External edits (scp, a text editor over SSH) are rare and never
+# latency-sensitive, so poll gently; the web UI goes through mark_dirty
+# and doesn't depend on this at all
+CONFIG_POLL_SECONDS = 2
+
+def config_watch_loop():
+    # One stat syscall per poll instead of a watchdog/inotify observer
+    # thread; also naturally coalesces editor save bursts into one reload.
+    # Compares against _cfg_mtime, which save_config updates after its
+    # own writes, so the process never reloads a file it just wrote.
+    while True:
+        time.sleep(CONFIG_POLL_SECONDS)
+        try:
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        except OSError:
+            continue
+        if mtime != _cfg_mtime:
+            print("Config file changed externally, reloading...")
+            load_config()
 
 # ----------------------
 # Main
@@ -450,15 +641,32 @@ if __name__ == "__main__":
     pump_thread = threading.Thread(target=pump_loop, daemon=True)
     pump_thread.start()
     print("Pump control thread started")
+
+    # Start config writer thread
+    writer_thread = threading.Thread(target=config_writer_loop, daemon=True)
+    writer_thread.start()
+    print("Config writer thread started")
     
-    # Start file watchdog
-    observer = start_watchdog()
-    print("Config file watchdog started")
-    
+    # Start config file watcher thread
+    watch_thread = threading.Thread(target=config_watch_loop, daemon=True)
+    watch_thread.start()
+    print("Config file watcher started")
+
+    # Quiet per-request access logging; formatting a log line per
+    # /status poll costs more than the request handling itself
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    logging.getLogger("waitress").setLevel(logging.WARNING)
+
+    # Prefer waitress over the Werkzeug dev server: lower per-request
+    # overhead and a small thread pool for concurrent /status pollers
     try:
-        print("Starting Flask server on port 5000...")
+        from waitress import serve
+    except ImportError:
+        serve = None
+    if serve:
+        print("Starting waitress server on port 5000...")
+        serve(app, host="0.0.0.0", port=5000, threads=4, channel_timeout=30)
+    else:
+        print("waitress not installed, starting Flask dev server on port 5000...")
         app.run(host="0.0.0.0", port=5000, debug=False)
-    finally:
-        observer.stop()
-        observer.join()
-        print("Application stopped")
+    print("Application stopped")
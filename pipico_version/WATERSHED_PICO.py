@@ -34,13 +34,17 @@ default_config = {
 # Current state
 current_config = default_config.copy()
 flush_mode = False
-current_speed = 0.0
-target_speed = 0.0
+# Motor state kept in the integer duty domain (0..65535) end-to-end;
+# int ops are much cheaper than soft-float on the RP2040 and duty_u16
+# wants an int anyway. Floats only exist at the HTTP/config boundary.
+current_duty = 0
+target_duty = 0
+fade_start_duty = 0
+fade_delta_duty = 0  # target_duty - fade_start_duty, precomputed
 pump_running = False
 last_pump_time = 0
 fade_start_time = 0
 fade_duration = 0
-fade_start_speed = 0.0
 last_state = None
 cycle_start_time = 0
 
@@ -83,36 +87,86 @@ def save_config():
         return False
 
 # Motor control functions
-def set_motor_speed(speed):
-    """Set motor speed (0.0 to 1.0)"""
-    global current_speed
-    speed = max(0.0, min(1.0, speed))
-    current_speed = speed
-    if speed > 0:
+def set_motor_duty(duty):
+    """Set motor duty (0..65535)"""
+    global current_duty
+    duty = max(0, min(65535, duty))
+    current_duty = duty
+    if duty > 0:
         m1.value(1)
         m2.value(0)
-        en1_pwm.duty_u16(int(speed * 65535))
+        en1_pwm.duty_u16(duty)
     else:
         m1.value(0)
         m2.value(0)
         en1_pwm.duty_u16(0)
 
-def fade_to_speed(target, duration_ms):
-    """Schedule fade to target speed over duration"""
-    global target_speed, fade_start_time, fade_duration, fade_start_speed
-    target_speed = max(0.0, min(1.0, target))
-    fade_start_speed = current_speed
-    fade_start_time = utime.ticks_ms()
+def set_motor_speed(speed):
+    """Set motor speed (0.0 to 1.0); float convenience wrapper"""
+    set_motor_duty(int(max(0.0, min(1.0, speed)) * 65535))
+
+def fade_to_speed(target, duration_ms, start_ms=None):
+    """Schedule fade to target speed over duration. start_ms lets the
+    timer callback anchor the fade to its scheduled deadline instead of
+    the (jittered) actual callback entry time."""
+    global target_duty, fade_start_time, fade_duration, fade_start_duty, fade_delta_duty
+    # Convert to the integer duty domain once, so fade ticks are
+    # pure-integer arithmetic
+    target_duty = min(65535, max(0, int(max(0.0, min(1.0, target)) * 65535)))
+    fade_start_duty = current_duty
+    fade_delta_duty = target_duty - fade_start_duty
+    fade_start_time = utime.ticks_ms() if start_ms is None else start_ms
     fade_duration = max(1, duration_ms)
 
 # Main timer loop
 main_timer = Timer()
 
+# Set True to re-enable state prints from inside the timer callback.
+# Serial/USB I/O from the callback can block for milliseconds and
+# jitter the fade interpolation, so it's off by default.
+DEBUG = False
+
+# Upper bound between ticks; the 5 s watchdog must keep getting fed
+# even when the next pump event is far away
+WDT_FEED_MS = 2000
+# Tick cadence while a fade is in progress
+FADE_TICK_MS = 20
+
+def _next_delay_ms(now):
+    """Milliseconds until the next scheduled event (fade step, cycle
+    start or cycle end), capped so the watchdog stays fed."""
+    if fade_duration > 0:
+        return FADE_TICK_MS
+    delay = WDT_FEED_MS
+    if not flush_mode and current_config['pump_on']:
+        if pump_running:
+            remaining = current_config['on_duration_ms'] - utime.ticks_diff(now, cycle_start_time)
+        else:
+            remaining = current_config['interval_ms'] - utime.ticks_diff(now, last_pump_time)
+        delay = min(delay, remaining)
+    return max(1, delay)
+
+# Deadline the armed one-shot timer is expected to fire at; lets the
+# callback measure its own lateness and compensate when re-arming
+scheduled_tick_ms = None
+
+def _arm_timer(now, lateness=0):
+    global scheduled_tick_ms
+    delay = _next_delay_ms(now)
+    if lateness > 0:
+        delay = max(1, delay - lateness)
+    scheduled_tick_ms = utime.ticks_add(now, delay)
+    main_timer.init(period=delay, mode=Timer.ONE_SHOT, callback=main_loop_tick)
+
 def main_loop_tick(t):
-    global pump_running, last_pump_time, current_speed, fade_duration
+    global pump_running, last_pump_time, fade_duration
     global last_state, cycle_start_time
 
     now = utime.ticks_ms()
+    if scheduled_tick_ms is None:
+        lateness = 0
+    else:
+        lateness = utime.ticks_diff(now, scheduled_tick_ms)
 
     # Feed watchdog
     wdt.feed()
@@ -121,46 +175,59 @@ def main_loop_tick(t):
     if fade_duration > 0:
         elapsed = utime.ticks_diff(now, fade_start_time)
         if elapsed >= fade_duration:
-            set_motor_speed(target_speed)
+            set_motor_duty(target_duty)
             fade_duration = 0
         else:
-            progress = elapsed / fade_duration
-            new_speed = fade_start_speed + (target_speed - fade_start_speed) * progress
-            set_motor_speed(new_speed)
+            set_motor_duty(fade_start_duty + fade_delta_duty * elapsed // fade_duration)
 
     # Skip normal cycle if flush mode
     if flush_mode:
         if last_state != "flush":
-            print("Flush mode active: Pump running continuously at full speed")
+            if DEBUG:
+                print("Flush mode active: Pump running continuously at full speed")
             last_state = "flush"
+        _arm_timer(now, lateness)
         return
 
     # Start pump cycle
     if current_config['pump_on']:
         if not pump_running and utime.ticks_diff(now, last_pump_time) >= current_config['interval_ms']:
             pump_running = True
-            cycle_start_time = now
-            fade_to_speed(current_config['max_speed'], current_config['fade_time_ms'])
-            print("Pump fading in...")
+            # Anchor the cycle and fade to the scheduled deadline so
+            # callback jitter doesn't accumulate into phase drift
+            cycle_start_time = scheduled_tick_ms if lateness > 0 else now
+            fade_to_speed(current_config['max_speed'], current_config['fade_time_ms'],
+                          start_ms=cycle_start_time)
+            if DEBUG:
+                print("Pump fading in...")
 
     # Stop pump after on_duration_ms
     if pump_running and utime.ticks_diff(now, cycle_start_time) >= current_config['on_duration_ms']:
         fade_to_speed(0, current_config['fade_time_ms'])
         pump_running = False
         last_pump_time = now   # mark end of cycle for interval tracking
-        print("Pump fading out...")
+        if DEBUG:
+            print("Pump fading out...")
         last_state = None      # <-- allow "Waiting..." to be printed again
 
 
     # Waiting state
     if not pump_running and last_state != "waiting":
-        print("Waiting for next cycle...")
+        if DEBUG:
+            print("Waiting for next cycle...")
         last_state = "waiting"
 
+    # Re-arm for the next event instead of a fixed 100 ms period; while
+    # waiting out a 30 s interval this drops the tick rate from 10 Hz to
+    # one wakeup every WDT_FEED_MS
+    _arm_timer(now, lateness)
+
 
 def setup_pump_timer():
-    """Setup main loop timer"""
-    main_timer.init(period=100, mode=Timer.PERIODIC, callback=main_loop_tick)
+    """(Re)arm the main loop timer to fire immediately"""
+    global scheduled_tick_ms
+    scheduled_tick_ms = utime.ticks_add(utime.ticks_ms(), 1)
+    main_timer.init(period=1, mode=Timer.ONE_SHOT, callback=main_loop_tick)
 
 # Setup WiFi Access Point
 def setup_ap():
@@ -177,6 +244,7 @@ def setup_ap():
     return ap
 
 # Initialize
+json.dumps(None)  # warm up the JSON module's internal caches once at boot
 load_config()
 ap = setup_ap()
 led.on()
@@ -185,274 +253,302 @@ led.on()
 app = Microdot()
 
 # HTML template
-def get_html():
+# The page skeleton (head, CSS, scripts) is kept in static bytes
+# constants allocated once at boot; each request only builds the small
+# dynamic fragment. This cuts per-request heap churn from ~10 KB to
+# well under 1 KB, which keeps GC pauses out of main_loop_tick.
+_HTML_HEAD = b"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Watershed Pump Control</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <meta http-equiv="refresh" content="10">
+    <link rel="stylesheet" href="/style.css">
+</head>
+<body>
+    <div class="container">
+        <h1>Watershed Pump Control</h1>
+"""
+
+# Served separately with a long max-age so browsers cache it across
+# the 10 s page refreshes; only the HTML travels each reload
+_STYLE_CSS = b"""
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+        }
+        .container {
+            background: rgba(255, 255, 255, 0.95);
+            border-radius: 20px;
+            padding: 25px;
+            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #333;
+            margin: 0 0 30px 0;
+            text-align: center;
+            font-size: 28px;
+        }
+        .card {
+            background: white;
+            border-radius: 15px;
+            padding: 20px;
+            margin-bottom: 20px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.07);
+        }
+        h2 {
+            color: #555;
+            margin-top: 0;
+            font-size: 20px;
+            border-bottom: 2px solid #f0f0f0;
+            padding-bottom: 10px;
+        }
+        .control-group {
+            margin: 20px 0;
+            padding: 15px;
+            background: #f8f9fa;
+            border-radius: 10px;
+            border: 1px solid #e9ecef;
+        }
+        label {
+            display: block;
+            margin-bottom: 8px;
+            font-weight: 600;
+            color: #495057;
+            font-size: 14px;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+        input[type="number"] {
+            width: 100%;
+            padding: 12px;
+            border: 2px solid #e9ecef;
+            border-radius: 8px;
+            box-sizing: border-box;
+            font-size: 16px;
+            transition: border-color 0.3s;
+            background: white;
+        }
+        input[type="number"]:focus {
+            outline: none;
+            border-color: #667eea;
+        }
+        button {
+            padding: 12px 24px;
+            font-size: 16px;
+            font-weight: 600;
+            border: none;
+            border-radius: 8px;
+            cursor: pointer;
+            margin: 5px;
+            transition: all 0.3s;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+        .btn-primary {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
+        }
+        .btn-danger {
+            color: white;
+            font-weight: bold;
+            box-shadow: 0 4px 15px rgba(255, 68, 68, 0.3);
+        }
+        .btn-save {
+            background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
+            color: white;
+            width: 100%;
+            margin-top: 20px;
+            padding: 14px;
+            font-size: 18px;
+            box-shadow: 0 4px 15px rgba(56, 239, 125, 0.4);
+        }
+        .status {
+            display: inline-block;
+            padding: 6px 12px;
+            border-radius: 20px;
+            font-weight: 600;
+            font-size: 12px;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+        .status-on {
+            background: #d4edda;
+            color: #155724;
+            border: 1px solid #c3e6cb;
+        }
+        .status-off {
+            background: #f8d7da;
+            color: #721c24;
+            border: 1px solid #f5c6cb;
+        }
+        .warning {
+            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+            color: white;
+            padding: 15px;
+            border-radius: 10px;
+            margin: 15px 0;
+            font-weight: 600;
+            box-shadow: 0 4px 15px rgba(245, 87, 108, 0.3);
+            animation: pulse 2s infinite;
+        }
+        @keyframes pulse {
+            0% { transform: scale(1); }
+            50% { transform: scale(1.02); }
+            100% { transform: scale(1); }
+        }
+        .info-text {
+            color: #6c757d;
+            font-size: 12px;
+            margin-top: 5px;
+        }
+        .button-group {
+            display: flex;
+            gap: 10px;
+            justify-content: center;
+        }
+"""
+
+_HTML_TAIL = b"""
+        <div style="text-align: center; color: #6c757d; font-size: 12px; margin-top: 20px;">
+            Auto-refresh every 10 seconds | IP: 192.168.4.1
+        </div>
+    </div>
+
+    <script>
+        function togglePump() {
+            fetch('/api/toggle_pump', {method: 'POST'})
+                .then(() => location.reload())
+                .catch(err => alert('Error: ' + err));
+        }
+
+        function toggleFlush() {
+            const msg = flushActive ? "Stop flush mode?" : "Start flush mode? This will run the pump continuously at full speed!";
+            if (!confirm(msg)) return;
+            fetch('/api/toggle_flush', {method: 'POST'})
+                .then(() => location.reload())
+                .catch(err => alert('Error: ' + err));
+        }
+
+        function saveSettings() {
+            const settings = {
+                interval_ms: parseInt(document.getElementById('interval').value),
+                on_duration_ms: parseInt(document.getElementById('duration').value),
+                fade_time_ms: parseInt(document.getElementById('fade').value),
+                max_speed: parseFloat(document.getElementById('speed').value)
+            };
+
+            if (settings.max_speed < 0 || settings.max_speed > 1) {
+                alert('Speed must be between 0.0 and 1.0');
+                return;
+            }
+
+            fetch('/api/save', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify(settings)
+            })
+            .then(response => response.text())
+            .then(result => {
+                alert(result);
+                location.reload();
+            })
+            .catch(err => alert('Error saving: ' + err));
+        }
+    </script>
+</body>
+</html>
+"""
+
+def get_dynamic_html():
+    """The part of the page that actually changes with state."""
     status = "ON" if current_config['pump_on'] else "OFF"
     flush_status = "ON (ACTIVE)" if flush_mode else "OFF"
     flush_color = "#ff4444" if flush_mode else "#888"
 
     return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Watershed Pump Control</title>
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <meta http-equiv="refresh" content="10">
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-            }}
-            .container {{
-                background: rgba(255, 255, 255, 0.95);
-                border-radius: 20px;
-                padding: 25px;
-                box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            }}
-            h1 {{
-                color: #333;
-                margin: 0 0 30px 0;
-                text-align: center;
-                font-size: 28px;
-            }}
-            .card {{
-                background: white;
-                border-radius: 15px;
-                padding: 20px;
-                margin-bottom: 20px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.07);
-            }}
-            h2 {{
-                color: #555;
-                margin-top: 0;
-                font-size: 20px;
-                border-bottom: 2px solid #f0f0f0;
-                padding-bottom: 10px;
-            }}
-            .control-group {{
-                margin: 20px 0;
-                padding: 15px;
-                background: #f8f9fa;
-                border-radius: 10px;
-                border: 1px solid #e9ecef;
-            }}
-            label {{
-                display: block;
-                margin-bottom: 8px;
-                font-weight: 600;
-                color: #495057;
-                font-size: 14px;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-            }}
-            input[type="number"] {{
-                width: 100%;
-                padding: 12px;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                box-sizing: border-box;
-                font-size: 16px;
-                transition: border-color 0.3s;
-                background: white;
-            }}
-            input[type="number"]:focus {{
-                outline: none;
-                border-color: #667eea;
-            }}
-            button {{
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: 600;
-                border: none;
-                border-radius: 8px;
-                cursor: pointer;
-                margin: 5px;
-                transition: all 0.3s;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-            }}
-            .btn-primary {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-            }}
-            .btn-danger {{
-                background: {flush_color};
-                color: white;
-                font-weight: bold;
-                box-shadow: 0 4px 15px rgba(255, 68, 68, 0.3);
-            }}
-            .btn-save {{
-                background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                color: white;
-                width: 100%;
-                margin-top: 20px;
-                padding: 14px;
-                font-size: 18px;
-                box-shadow: 0 4px 15px rgba(56, 239, 125, 0.4);
-            }}
-            .status {{
-                display: inline-block;
-                padding: 6px 12px;
-                border-radius: 20px;
-                font-weight: 600;
-                font-size: 12px;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-            }}
-            .status-on {{
-                background: #d4edda;
-                color: #155724;
-                border: 1px solid #c3e6cb;
-            }}
-            .status-off {{
-                background: #f8d7da;
-                color: #721c24;
-                border: 1px solid #f5c6cb;
-            }}
-            .warning {{
-                background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                color: white;
-                padding: 15px;
-                border-radius: 10px;
-                margin: 15px 0;
-                font-weight: 600;
-                box-shadow: 0 4px 15px rgba(245, 87, 108, 0.3);
-                animation: pulse 2s infinite;
-            }}
-            @keyframes pulse {{
-                0% {{ transform: scale(1); }}
-                50% {{ transform: scale(1.02); }}
-                100% {{ transform: scale(1); }}
-            }}
-            .info-text {{
-                color: #6c757d;
-                font-size: 12px;
-                margin-top: 5px;
-            }}
-            .button-group {{
-                display: flex;
-                gap: 10px;
-                justify-content: center;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Watershed Pump Control</h1>
-            
-            <div class="card">
-                <h2>Main Controls</h2>
+        <div class="card">
+            <h2>Main Controls</h2>
+            <div class="control-group">
+                <label>Pump Status</label>
+                <div class="button-group">
+                    <span class="status {'status-on' if current_config['pump_on'] else 'status-off'}">{status}</span>
+                    <button class="btn-primary" onclick="togglePump()">
+                        {'TURN OFF' if current_config['pump_on'] else 'TURN ON'}
+                    </button>
+                </div>
+            </div>
+
+            <div class="control-group">
+                <label>Flush Mode</label>
+                <div class="button-group">
+                    <span class="status" style="background: {flush_color}; color: white;">{flush_status}</span>
+                    <button class="btn-danger" style="background: {flush_color};" onclick="toggleFlush()">
+                        {'STOP FLUSH' if flush_mode else 'START FLUSH'}
+                    </button>
+                </div>
+                {'<div class="warning">FLUSH MODE ACTIVE - Pump running continuously at full speed!</div>' if flush_mode else ''}
+            </div>
+        </div>
+
+        <div class="card">
+            <h2>Pump Settings</h2>
+            <form id="settingsForm">
                 <div class="control-group">
-                    <label>Pump Status</label>
-                    <div class="button-group">
-                        <span class="status {'status-on' if current_config['pump_on'] else 'status-off'}">{status}</span>
-                        <button class="btn-primary" onclick="togglePump()">
-                            {'TURN OFF' if current_config['pump_on'] else 'TURN ON'}
-                        </button>
-                    </div>
+                    <label for="interval">Interval (ms)</label>
+                    <input type="number" id="interval" value="{current_config['interval_ms']}" min="100" max="3600000">
+                    <div class="info-text">Time between pump cycles</div>
                 </div>
-                
+
                 <div class="control-group">
-                    <label>Flush Mode</label>
-                    <div class="button-group">
-                        <span class="status" style="background: {flush_color}; color: white;">{flush_status}</span>
-                        <button class="btn-danger" onclick="toggleFlush()">
-                            {'STOP FLUSH' if flush_mode else 'START FLUSH'}
-                        </button>
-                    </div>
-                    {'<div class="warning">FLUSH MODE ACTIVE - Pump running continuously at full speed!</div>' if flush_mode else ''}
+                    <label for="duration">On Duration (ms)</label>
+                    <input type="number" id="duration" value="{current_config['on_duration_ms']}" min="10" max="60000">
+                    <div class="info-text">How long pump runs per cycle</div>
                 </div>
-            </div>
-            
-            <div class="card">
-                <h2>Pump Settings</h2>
-                <form id="settingsForm">
-                    <div class="control-group">
-                        <label for="interval">Interval (ms)</label>
-                        <input type="number" id="interval" value="{current_config['interval_ms']}" min="100" max="3600000">
-                        <div class="info-text">Time between pump cycles</div>
-                    </div>
-                    
-                    <div class="control-group">
-                        <label for="duration">On Duration (ms)</label>
-                        <input type="number" id="duration" value="{current_config['on_duration_ms']}" min="10" max="60000">
-                        <div class="info-text">How long pump runs per cycle</div>
-                    </div>
-                    
-                    <div class="control-group">
-                        <label for="fade">Fade Time (ms)</label>
-                        <input type="number" id="fade" value="{current_config['fade_time_ms']}" min="0" max="5000">
-                        <div class="info-text">Speed ramp up/down time</div>
-                    </div>
-                    
-                    <div class="control-group">
-                        <label for="speed">Max Speed (0.0 - 1.0)</label>
-                        <input type="number" id="speed" value="{current_config['max_speed']}" min="0" max="1" step="0.1">
-                        <div class="info-text">Maximum pump speed during operation</div>
-                    </div>
-                    
-                    <button type="button" class="btn-save" onclick="saveSettings()">SAVE SETTINGS</button>
-                </form>
-            </div>
-            
-            <div style="text-align: center; color: #6c757d; font-size: 12px; margin-top: 20px;">
-                Auto-refresh every 10 seconds | IP: 192.168.4.1
-            </div>
+
+                <div class="control-group">
+                    <label for="fade">Fade Time (ms)</label>
+                    <input type="number" id="fade" value="{current_config['fade_time_ms']}" min="0" max="5000">
+                    <div class="info-text">Speed ramp up/down time</div>
+                </div>
+
+                <div class="control-group">
+                    <label for="speed">Max Speed (0.0 - 1.0)</label>
+                    <input type="number" id="speed" value="{current_config['max_speed']}" min="0" max="1" step="0.1">
+                    <div class="info-text">Maximum pump speed during operation</div>
+                </div>
+
+                <button type="button" class="btn-save" onclick="saveSettings()">SAVE SETTINGS</button>
+            </form>
         </div>
-        
-        <script>
-            function togglePump() {{
-                fetch('/api/toggle_pump', {{method: 'POST'}})
-                    .then(() => location.reload())
-                    .catch(err => alert('Error: ' + err));
-            }}
-            
-            function toggleFlush() {{
-                const msg = {('"Stop flush mode?"' if flush_mode else '"Start flush mode? This will run the pump continuously at full speed!"')};
-                if (!confirm(msg)) return;
-                fetch('/api/toggle_flush', {{method: 'POST'}})
-                    .then(() => location.reload())
-                    .catch(err => alert('Error: ' + err));
-            }}
-            
-            function saveSettings() {{
-                const settings = {{
-                    interval_ms: parseInt(document.getElementById('interval').value),
-                    on_duration_ms: parseInt(document.getElementById('duration').value),
-                    fade_time_ms: parseInt(document.getElementById('fade').value),
-                    max_speed: parseFloat(document.getElementById('speed').value)
-                }};
-                
-                if (settings.max_speed < 0 || settings.max_speed > 1) {{
-                    alert('Speed must be between 0.0 and 1.0');
-                    return;
-                }}
-                
-                fetch('/api/save', {{
-                    method: 'POST',
-                    headers: {{'Content-Type': 'application/json'}},
-                    body: JSON.stringify(settings)
-                }})
-                .then(response => response.text())
-                .then(result => {{
-                    alert(result);
-                    location.reload();
-                }})
-                .catch(err => alert('Error saving: ' + err));
-            }}
-        </script>
-    </body>
-    </html>
-    """
+
+        <script>const flushActive = {'true' if flush_mode else 'false'};</script>
+"""
 
 # Routes
 @app.route('/')
 def index(request):
-    return get_html(), 200, {'Content-Type': 'text/html'}
+    # Stream the page in three chunks so the full document is never
+    # assembled into one large string on the heap
+    def body():
+        yield _HTML_HEAD
+        yield get_dynamic_html().encode()
+        yield _HTML_TAIL
+    # Connection: close keeps half-open sockets from piling up between
+    # the 10 s page refreshes
+    return Response(body=body(), headers={'Content-Type': 'text/html',
+                                          'Connection': 'close'})
+
+@app.route('/style.css')
+def style_css(request):
+    return Response(body=_STYLE_CSS,
+                    headers={'Content-Type': 'text/css',
+                             'Cache-Control': 'public, max-age=31536000'})
 
 @app.route('/api/status')
 def status(request):
@@ -460,7 +556,7 @@ def status(request):
         'pump_on': current_config['pump_on'],
         'flush_mode': flush_mode,
         'config': current_config,
-        'current_speed': current_speed,
+        'current_speed': current_duty / 65535,
         'pump_running': pump_running
     })
 
@@ -488,6 +584,8 @@ def toggle_flush(request):
 def save_settings(request):
     global current_config
     try:
+        # request.body is pre-read bytes on both Microdot 1.x and 2.x;
+        # 2.x's request.stream is async and can't be fed to json.load
         new_settings = json.loads(request.body)
         if 'interval_ms' in new_settings:
             current_config['interval_ms'] = max(100, int(new_settings['interval_ms']))